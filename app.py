@@ -1,7 +1,7 @@
 import os
 import requests
 import google.generativeai as genai
-from flask import Flask, jsonify
+from flask import Flask, jsonify, request
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 import smtplib
@@ -15,7 +15,22 @@ from reportlab.lib.colors import HexColor
 from reportlab.lib.units import inch
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
 import io
-from bs4 import BeautifulSoup
+import sys
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+import gzip
+import heapq
+import hashlib
+import html as html_lib
+import threading
+from collections import OrderedDict
+import brotli
+import numpy as np
+from scipy import sparse
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import html as lxml_html
+from urllib.parse import urljoin, urlparse
 import pytz
 from dotenv import load_dotenv
 from datetime import datetime, timedelta
@@ -30,8 +45,8 @@ app = Flask(__name__)
 class ConfigLoader:
     
     @staticmethod
-    def load_lines(filename):
-        filepath = os.path.join('config', filename)
+    def load_lines(filename, config_dir='config'):
+        filepath = os.path.join(config_dir, filename)
         try:
             with open(filepath, 'r', encoding='utf-8') as file:
                 lines = [line.strip() for line in file.readlines()]
@@ -44,8 +59,8 @@ class ConfigLoader:
             return []
     
     @staticmethod
-    def load_text(filename):
-        filepath = os.path.join('config', filename)
+    def load_text(filename, config_dir='config'):
+        filepath = os.path.join(config_dir, filename)
         try:
             with open(filepath, 'r', encoding='utf-8') as file:
                 return file.read().strip()
@@ -56,32 +71,277 @@ class ConfigLoader:
             print(f"Error loading {filepath}: {e}")
             return ""
 
-class NewsProcessor:
+    @staticmethod
+    def load_json(filename, config_dir='config'):
+        filepath = os.path.join(config_dir, filename)
+        try:
+            with open(filepath, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except FileNotFoundError:
+            print(f"Warning: {filepath} not found, using default values")
+            return {}
+        except Exception as e:
+            print(f"Error loading {filepath}: {e}")
+            return {}
+
+class Article:
+
+    __slots__ = ('title', 'description', 'source', 'url', 'published', 'relevance_score', 'cluster_size')
+
+    def __init__(self, title, description, source, url='', published='', relevance_score=0, cluster_size=1):
+        self.title = ' '.join(title.split())
+        self.description = ' '.join(description.split())
+        self.source = sys.intern(source)
+        self.url = url
+        self.published = published
+        self.relevance_score = relevance_score
+        self.cluster_size = cluster_size
+
+    @property
+    def text(self):
+        return f"{self.title} {self.description}"
+
+    def replace(self, **changes):
+        values = self.to_dict()
+        values.update(changes)
+        return Article(**values)
+
+    def to_dict(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{key: value for key, value in data.items() if key in cls.__slots__})
+
+class StoryClusterer:
+
+    STOP_WORDS = frozenset([
+        'the', 'and', 'for', 'with', 'from', 'that', 'this', 'into', 'over', 'after',
+        'its', 'are', 'was', 'were', 'has', 'have', 'had', 'will', 'said', 'says',
+        'new', 'now', 'amid', 'about', 'more', 'than', 'also', 'but', 'not', 'all',
+        'of', 'to', 'in', 'on', 'at', 'by', 'as', 'is', 'it', 'an', 'be', 'or'
+    ])
+
+    def __init__(self, threshold=0.5, max_extra_facts=2):
+        self.threshold = threshold
+        self.max_extra_facts = max_extra_facts
+
+    @classmethod
+    def tokenize(cls, text):
+        return [token for token in re.findall(r'[a-z0-9]+', text.lower())
+                if len(token) > 1 and token not in cls.STOP_WORDS]
+
+    def tfidf_matrix(self, texts):
+        vocabulary = {}
+        rows, cols, counts = [], [], []
+
+        for row, text in enumerate(texts):
+            term_counts = {}
+            for token in self.tokenize(text):
+                col = vocabulary.setdefault(token, len(vocabulary))
+                term_counts[col] = term_counts.get(col, 0) + 1
+            rows.extend([row] * len(term_counts))
+            cols.extend(term_counts.keys())
+            counts.extend(term_counts.values())
+
+        n_docs = len(texts)
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        counts = np.asarray(counts, dtype=np.float64)
+
+        doc_freq = np.bincount(cols, minlength=len(vocabulary))
+        idf = np.log((1.0 + n_docs) / (1.0 + doc_freq)) + 1.0
+        data = (1.0 + np.log(counts)) * idf[cols]
+
+        norms = np.sqrt(np.bincount(rows, weights=data ** 2, minlength=n_docs))
+        norms[norms == 0] = 1.0
+        data /= norms[rows]
+
+        return sparse.csr_matrix((data, (rows, cols)), shape=(n_docs, len(vocabulary)))
+
+    def cluster(self, articles):
+        if len(articles) < 2:
+            return list(articles)
+
+        matrix = self.tfidf_matrix([article.text for article in articles])
+        similarity = (matrix @ matrix.T).tocsr()
+
+        scores = np.array([article.relevance_score for article in articles])
+        order = np.argsort(-scores, kind='stable')
+        assigned = np.zeros(len(articles), dtype=bool)
+        stories = []
+
+        for leader in order:
+            if assigned[leader]:
+                continue
+            start, end = similarity.indptr[leader], similarity.indptr[leader + 1]
+            neighbours = similarity.indices[start:end][similarity.data[start:end] >= self.threshold]
+            members = neighbours[~assigned[neighbours]]
+            assigned[members] = True
+            assigned[leader] = True
+            stories.append(self.merge(articles[leader], [articles[i] for i in members if i != leader]))
+
+        return stories
+
+    def merge(self, representative, duplicates):
+        if not duplicates:
+            return representative
+
+        sources = [representative.source]
+        facts = []
+
+        for article in duplicates:
+            if article.source not in sources:
+                sources.append(article.source)
+            for sentence in re.split(r'(?<=[.!?])\s+', article.description):
+                sentence = sentence.strip()
+                if re.search(r'\d', sentence) and sentence not in representative.description and sentence not in facts:
+                    facts.append(sentence)
+
+        return representative.replace(
+            description=' '.join([representative.description] + facts[:self.max_extra_facts]),
+            source=', '.join(sources),
+            cluster_size=len(duplicates) + 1,
+            relevance_score=max(a.relevance_score for a in [representative] + duplicates)
+        )
+
+class RunDeadline:
+
+    STAGES = ['fetch', 'ai', 'render', 'send']
+
+    def __init__(self, budgets, deadline_ts=None):
+        self.budgets = budgets
+        self.deadline_ts = deadline_ts
+        self.started = {}
+
+    def start(self, stage):
+        self.started[stage] = time.time()
+
+    def remaining(self, stage):
+        now = time.time()
+        limit = self.started.get(stage, now) + self.budgets[stage]
+        if self.deadline_ts is not None:
+            limit = min(limit, self.deadline_ts - self.budget_after(stage))
+        return max(0.0, limit - now)
+
+    def budget_after(self, stage):
+        return sum(self.budgets[s] for s in self.STAGES[self.STAGES.index(stage) + 1:])
+
+    def on_time(self):
+        return self.deadline_ts is None or time.time() <= self.deadline_ts
+
+class ReportCache:
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def put(self, key, entry):
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, profile_name, date_str):
+        with self.lock:
+            for key in [k for k in self.entries if k[0] == 'list' or k[:2] == (profile_name, date_str)]:
+                del self.entries[key]
+
+class ExamProfile:
+
+    DEFAULT_PROFILE = 'ibps_rrb'
+
+    DEFAULT_SCORING_KEYWORDS = {
+        'high': [
+            'rbi', 'sebi', 'bank', 'banking', 'finance', 'financial', 'monetary', 'policy',
+            'inflation', 'gdp', 'economic', 'economy', 'government', 'scheme', 'yojana',
+            'rupee', 'investment', 'growth', 'credit', 'loan', 'deposit', 'interest',
+            'rate', 'budget', 'fiscal', 'revenue', 'tax', 'subsidy', 'npa', 'nbfc',
+            'cooperative', 'rrb', 'rural', 'agriculture', 'farmer', 'kisan', 'msp'
+        ],
+        'medium': [
+            'trade', 'market', 'nifty', 'sensex', 'mutual', 'fund', 'insurance',
+            'bonds', 'equity', 'debt', 'capital', 'regulation', 'compliance',
+            'digital', 'payment', 'upi', 'fintech'
+        ],
+        'low': [
+            'international', 'foreign', 'sports', 'award', 'achievement'
+        ]
+    }
 
-    def __init__(self):
-        self.gemini_key = os.getenv('GEMINI_API_KEY')
-        self.news_api_key = os.getenv('NEWS_API_KEY')
-        self.email_user = os.getenv('EMAIL_USER')
-        self.email_pass = os.getenv('EMAIL_PASSWORD')
-        self.recipient = os.getenv('RECIPIENT_EMAIL')
+    DEFAULT_BUDGETS = {'fetch': 180, 'ai': 600, 'render': 60, 'send': 60}
 
-        if not all([self.gemini_key, self.email_user, self.email_pass, self.recipient]):
-            raise ValueError("Missing required environment variables")
+    def __init__(self, name, settings):
+        self.name = name
+        self.title = settings.get('title', name.replace('_', ' ').upper())
+        self.config_dir = settings.get('config_dir', os.path.join('config', 'profiles', name))
+
+        self.budgets = dict(self.DEFAULT_BUDGETS, **settings.get('budgets', {}))
+        self.deadline = self._parse_time(settings['deadline']) if settings.get('deadline') else None
+        self.prefetch_minutes = int(settings.get('prefetch_minutes', 0))
+        self.auto_schedule = bool(self.deadline) and not settings.get('schedule')
+
+        if settings.get('schedule'):
+            self.schedule = self._parse_time(settings['schedule'])
+        elif self.deadline:
+            lead_minutes = -(-sum(self.budgets.values()) // 60)
+            self.schedule = self._shift_time(self.deadline, -lead_minutes)
+        else:
+            self.schedule = (20, 0)
+
+        recipients = os.getenv(settings.get('recipients_env', 'RECIPIENT_EMAIL'), '')
+        self.recipients = [r.strip() for r in recipients.split(',') if r.strip()]
 
-        genai.configure(api_key=self.gemini_key)
-        self.model = genai.GenerativeModel('gemini-1.5-flash')
-        
         self.load_config()
-        self.setup_database()
+
+    @staticmethod
+    def _parse_time(value):
+        hour, minute = value.split(':')
+        return (int(hour), int(minute))
+
+    @staticmethod
+    def _shift_time(hour_minute, minutes):
+        total = (hour_minute[0] * 60 + hour_minute[1] + minutes) % (24 * 60)
+        return (total // 60, total % 60)
+
+    def prefetch_time(self):
+        return self._shift_time(self.schedule, -self.prefetch_minutes) if self.prefetch_minutes else None
+
+    def run_deadline(self, now, enforce_deadline=True):
+        deadline_ts = None
+        if self.deadline and enforce_deadline:
+            target = now.replace(hour=self.deadline[0], minute=self.deadline[1], second=0, microsecond=0)
+            if target > now:
+                deadline_ts = target.timestamp()
+            else:
+                print(f"{self.name}: past today's {self.deadline[0]:02d}:{self.deadline[1]:02d} deadline, using stage budgets only")
+        return RunDeadline(self.budgets, deadline_ts)
+
+    def _load(self, loader, filename):
+        if self.config_dir != 'config' and os.path.exists(os.path.join(self.config_dir, filename)):
+            return loader(filename, self.config_dir)
+        return loader(filename)
 
     def load_config(self):
-        self.news_queries = ConfigLoader.load_lines('news_queries.txt')
-        self.rss_feeds = ConfigLoader.load_lines('rss_feeds.txt')
-        self.news_sites = ConfigLoader.load_lines('news_sites.txt')
-        self.relevant_keywords = ConfigLoader.load_lines('relevant_keywords.txt')
-        self.main_prompt_template = ConfigLoader.load_text('main_prompt.txt')
-        self.mcq_prompt_template = ConfigLoader.load_text('mcq_prompt.txt')
-        self.email_template = ConfigLoader.load_text('email_template.txt')
+        self.news_queries = self._load(ConfigLoader.load_lines, 'news_queries.txt')
+        self.rss_feeds = self._load(ConfigLoader.load_lines, 'rss_feeds.txt')
+        self.news_sites = self._load(ConfigLoader.load_lines, 'news_sites.txt')
+        self.relevant_keywords = self._load(ConfigLoader.load_lines, 'relevant_keywords.txt')
+        self.scoring_keywords = self.DEFAULT_SCORING_KEYWORDS
+        if os.path.exists(os.path.join(self.config_dir, 'scoring_keywords.json')):
+            self.scoring_keywords = ConfigLoader.load_json('scoring_keywords.json', self.config_dir) or self.DEFAULT_SCORING_KEYWORDS
+        self.main_prompt_template = self._load(ConfigLoader.load_text, 'main_prompt.txt')
+        self.mcq_prompt_template = self._load(ConfigLoader.load_text, 'mcq_prompt.txt')
+        self.email_template = self._load(ConfigLoader.load_text, 'email_template.txt')
         
         if not self.main_prompt_template:
             self.main_prompt_template = """You are an expert banking exam preparation assistant. Process these real news articles for IBPS RRB banking exam preparation on {current_date}.
@@ -189,59 +449,192 @@ Create questions that test knowledge of current banking and economic development
                 'finance', 'monetary', 'rupee', 'investment', 'growth'
             ]
 
+class NewsProcessor:
+
+    REPORT_SECTIONS = ['Banking Finance', 'Economic', 'Government Schemes', 'International', 'Sports Awards', 'General', 'Practice MCQs']
+    REPORT_TITLE_PATTERN = re.compile(r'^.+ News - \d{1,2} \w+ \d{4}$')
+    REPLAY_STAGES = ['prompt', 'normalize', 'index', 'pdf']
+    CATEGORY_LIMIT = 8
+    CANDIDATE_LIMIT = 200
+    LOW_PRIORITY_CATEGORIES = ('sports_awards', 'general')
+    AI_CALL_ESTIMATE = 20
+    FETCH_WORKERS = 8
+    FETCH_MIN_SECONDS = 45
+
+    def __init__(self):
+        self.gemini_key = os.getenv('GEMINI_API_KEY')
+        self.news_api_key = os.getenv('NEWS_API_KEY')
+        self.email_user = os.getenv('EMAIL_USER')
+        self.email_pass = os.getenv('EMAIL_PASSWORD')
+        self.recipient = os.getenv('RECIPIENT_EMAIL')
+
+        if not all([self.gemini_key, self.email_user, self.email_pass, self.recipient]):
+            raise ValueError("Missing required environment variables")
+
+        genai.configure(api_key=self.gemini_key)
+        self.model = genai.GenerativeModel('gemini-1.5-flash')
+        
+        self.story_clusterer = StoryClusterer()
+        self.report_cache = ReportCache()
+        self.fetch_lock = threading.Lock()
+        self.raw_fetch = None
+
+        self.load_config()
+        self.setup_database()
+
+    def load_config(self):
+        settings = ConfigLoader.load_json('profiles.json') or {
+            ExamProfile.DEFAULT_PROFILE: {'title': 'IBPS RRB', 'config_dir': 'config'}
+        }
+        self.profiles = {name: ExamProfile(name, profile_settings) for name, profile_settings in settings.items()}
+        self.default_profile = next(iter(self.profiles))
+        self._share_deadline_slots()
+
+        self.news_queries = self._merge_profile_lists('news_queries')
+        self.rss_feeds = self._merge_profile_lists('rss_feeds')
+        self.news_sites = self._merge_profile_lists('news_sites')
+        self.relevant_keywords = self._merge_profile_lists('relevant_keywords')
+        self.site_selectors = ConfigLoader.load_json('site_selectors.json')
+
+    def _merge_profile_lists(self, attribute):
+        merged = []
+        for profile in self.profiles.values():
+            for value in getattr(profile, attribute):
+                if value not in merged:
+                    merged.append(value)
+        return merged
+
+    def _share_deadline_slots(self):
+        # Profiles with the same deadline share one slot and run one after another, so it starts early enough for all of them
+        by_deadline = {}
+        for profile in self.profiles.values():
+            if profile.auto_schedule:
+                by_deadline.setdefault(profile.deadline, []).append(profile)
+        for deadline, profiles in by_deadline.items():
+            if len(profiles) > 1:
+                lead_seconds = max(p.budgets['fetch'] for p in profiles) + sum(p.budgets[s] for p in profiles for s in RunDeadline.STAGES[1:])
+                lead_minutes = -(-lead_seconds // 60)
+                schedule = ExamProfile._shift_time(deadline, -lead_minutes)
+                for profile in profiles:
+                    profile.schedule = schedule
+
+    def run_deadlines(self, names, now, scheduled=False):
+        deadlines = {name: self.profiles[name].run_deadline(now, enforce_deadline=scheduled) for name in names}
+        # Each profile must also leave room for the AI, render and send stages of the profiles queued after it
+        cutoff = None
+        for name in reversed(names):
+            deadline = deadlines[name]
+            if cutoff is not None and (deadline.deadline_ts is None or cutoff < deadline.deadline_ts):
+                deadline.deadline_ts = cutoff
+            if deadline.deadline_ts is not None:
+                cutoff = deadline.deadline_ts - deadline.budget_after('fetch')
+        return deadlines
+
+    def schedule_slots(self):
+        slots = {}
+        for profile in self.profiles.values():
+            slots.setdefault(profile.schedule, []).append(profile.name)
+        return slots
+
+    def prefetch_slots(self):
+        return sorted({profile.prefetch_time() for profile in self.profiles.values() if profile.prefetch_minutes})
+
     def setup_database(self):
         conn = sqlite3.connect('news_reports.db', check_same_thread=False)
         cursor = conn.cursor()
+
+        cursor.execute('PRAGMA table_info(daily_reports)')
+        report_columns = [r[1] for r in cursor.fetchall()]
+        legacy_reports = bool(report_columns) and 'profile' not in report_columns
+        if legacy_reports:
+            cursor.execute('ALTER TABLE daily_reports RENAME TO daily_reports_legacy')
+
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS daily_reports (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                date TEXT UNIQUE,
+                profile TEXT NOT NULL DEFAULT 'ibps_rrb',
+                date TEXT,
                 content TEXT,
                 articles_count INTEGER,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at REAL DEFAULT 0,
+                UNIQUE (profile, date)
+            )
+        ''')
+        if report_columns and not legacy_reports and 'updated_at' not in report_columns:
+            cursor.execute('ALTER TABLE daily_reports ADD COLUMN updated_at REAL DEFAULT 0')
+        if legacy_reports:
+            cursor.execute('''
+                INSERT INTO daily_reports (id, profile, date, content, articles_count, created_at)
+                SELECT id, ?, date, content, articles_count, created_at FROM daily_reports_legacy
+            ''', (ExamProfile.DEFAULT_PROFILE,))
+            cursor.execute('DROP TABLE daily_reports_legacy')
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS mcq_bank (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                profile TEXT NOT NULL DEFAULT 'ibps_rrb',
+                report_date TEXT,
+                question TEXT,
+                option_a TEXT,
+                option_b TEXT,
+                option_c TEXT,
+                option_d TEXT,
+                answer TEXT,
+                explanation TEXT,
+                box INTEGER DEFAULT 0,
+                next_due TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                times_served INTEGER DEFAULT 0,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS report_articles (
+                profile TEXT NOT NULL,
+                date TEXT NOT NULL,
+                articles TEXT,
+                PRIMARY KEY (profile, date)
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS replay_checkpoints (
+                run_id TEXT NOT NULL,
+                profile TEXT NOT NULL,
+                date TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (run_id, profile, date, stage)
+            )
+        ''')
+        cursor.execute('PRAGMA table_info(mcq_bank)')
+        if 'profile' not in [r[1] for r in cursor.fetchall()]:
+            cursor.execute("ALTER TABLE mcq_bank ADD COLUMN profile TEXT NOT NULL DEFAULT 'ibps_rrb'")
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_mcq_bank_profile_due ON mcq_bank (profile, next_due)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_mcq_bank_report_date ON mcq_bank (report_date)')
         conn.commit()
         conn.close()
 
-    def calculate_relevance_score(self, article):
-        content = (article['title'] + ' ' + article['description']).lower()
-        
-        high_relevance_keywords = [
-            'rbi', 'sebi', 'bank', 'banking', 'finance', 'financial', 'monetary', 'policy',
-            'inflation', 'gdp', 'economic', 'economy', 'government', 'scheme', 'yojana',
-            'rupee', 'investment', 'growth', 'credit', 'loan', 'deposit', 'interest',
-            'rate', 'budget', 'fiscal', 'revenue', 'tax', 'subsidy', 'npa', 'nbfc',
-            'cooperative', 'rrb', 'rural', 'agriculture', 'farmer', 'kisan', 'msp'
-        ]
-        
-        medium_relevance_keywords = [
-            'trade', 'market', 'nifty', 'sensex', 'mutual', 'fund', 'insurance',
-            'bonds', 'equity', 'debt', 'capital', 'regulation', 'compliance',
-            'digital', 'payment', 'upi', 'fintech'
-        ]
-        
-        low_relevance_keywords = [
-            'international', 'foreign', 'sports', 'award', 'achievement'
-        ]
-        
+    def calculate_relevance_score(self, article, profile):
+        content = article.text.lower()
+        keywords = profile.scoring_keywords
+
         score = 0
-        for keyword in high_relevance_keywords:
+        for keyword in keywords.get('high', []):
             if keyword in content:
                 score += 3
         
-        for keyword in medium_relevance_keywords:
+        for keyword in keywords.get('medium', []):
             if keyword in content:
                 score += 2
                 
-        for keyword in low_relevance_keywords:
+        for keyword in keywords.get('low', []):
             if keyword in content:
                 score += 1
                 
         return score
 
     def improved_categorization(self, article):
-        content = (article['title'] + ' ' + article['description']).lower()
+        content = article.text.lower()
         
         banking_keywords = [
             'rbi', 'sebi', 'bank', 'banking', 'finance', 'financial', 'credit',
@@ -283,107 +676,260 @@ Create questions that test knowledge of current banking and economic development
         else:
             return 'general'
 
-    def fetch_real_news(self):
-        all_articles = []
+    def fetch_raw_articles(self, max_age=3600, timeout=None):
+        # Waiting on a prefetch still in flight counts against the fetch budget
+        waiting_since = time.time()
+        if not self.fetch_lock.acquire(timeout=-1 if timeout is None else timeout):
+            cached = self.raw_fetch
+            print(f"Fetch budget spent waiting on another fetch, using {len(cached[1]) if cached else 0} cached articles")
+            return cached[1] if cached else []
 
+        try:
+            if self.raw_fetch and time.time() - self.raw_fetch[0] < max_age:
+                print(f"Reusing {len(self.raw_fetch[1])} articles fetched {int(time.time() - self.raw_fetch[0])}s ago")
+                return self.raw_fetch[1]
+
+            if timeout is not None:
+                timeout = max(0.0, timeout - (time.time() - waiting_since))
+            raw_articles, complete = self._fetch_all_sources(timeout)
+            # A fetch cut short by the timeout is used once but never cached, so the next run crawls again
+            if complete:
+                self.raw_fetch = (time.time(), raw_articles)
+            return raw_articles
+        finally:
+            self.fetch_lock.release()
+
+    def prefetch_articles(self):
+        print("Prefetching articles ahead of scheduled reports")
+        self.fetch_raw_articles(max_age=0)
+
+    def _fetch_all_sources(self, timeout=None):
+        sources = []
         if self.news_api_key:
-            for query in self.news_queries:
-                try:
-                    url = "https://newsapi.org/v2/everything"
-                    params = {
-                        'q': query,
-                        'language': 'en',
-                        'sortBy': 'publishedAt',
-                        'from': (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d'),
-                        'pageSize': 20,
-                        'apiKey': self.news_api_key
-                    }
-                    response = requests.get(url, params=params, timeout=10)
-                    if response.status_code == 200:
-                        data = response.json()
-                        articles = data.get('articles', [])
-                        for article in articles:
-                            if article.get('title') and article.get('description'):
-                                all_articles.append({
-                                    'title': article['title'],
-                                    'description': article['description'],
-                                    'source': article.get('source', {}).get('name', 'News API'),
-                                    'url': article.get('url', ''),
-                                    'published': article.get('publishedAt', '')
-                                })
-                    time.sleep(0.5)
-                except Exception as e:
-                    print(f"News API error for query {query}: {e}")
+            sources.append((self._newsapi_articles, self.news_queries))
+        sources += [(self._rss_articles, feed_url) for feed_url in self.rss_feeds]
+        sources += [(self._site_articles, site_url) for site_url in self.news_sites]
 
-        for feed_url in self.rss_feeds:
-            try:
-                headers = {'User-Agent': 'Mozilla/5.0 (compatible; NewsBot/1.0)'}
-                response = requests.get(feed_url, headers=headers, timeout=10)
-                soup = BeautifulSoup(response.content, 'xml')
-                items = soup.find_all('item')
-
-                for item in items:
-                    title = item.find('title')
-                    description = item.find('description')
-                    pub_date = item.find('pubDate')
-                    if title and description:
-                        title_text = title.text.strip()
-                        desc_text = BeautifulSoup(description.text, 'html.parser').get_text().strip()[:300]
-                        all_articles.append({
-                            'title': title_text,
-                            'description': desc_text,
-                            'source': feed_url.split('/')[2],
-                            'url': '',
-                            'published': pub_date.text if pub_date else ''
-                        })
-            except Exception as e:
-                print(f"RSS feed error for {feed_url}: {e}")
+        raw_articles = []
+        seen_titles = set()
+        complete = True
 
-        for site_url in self.news_sites:
+        executor = ThreadPoolExecutor(max_workers=self.FETCH_WORKERS)
+        futures = [executor.submit(lambda fetch, arg: list(fetch(arg)), fetch, arg) for fetch, arg in sources]
+        try:
+            for future in as_completed(futures, timeout=timeout):
+                for article in future.result():
+                    title_key = ' '.join(article.title.lower().split()[:8])
+
+                    if title_key not in seen_titles and len(article.title) > 15:
+                        seen_titles.add(title_key)
+                        raw_articles.append(article)
+        except FuturesTimeoutError:
+            abandoned = sum(not future.done() for future in futures)
+            print(f"Fetch budget spent, abandoning {abandoned} sources still in flight")
+            complete = False
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        print(f"Fetched {len(raw_articles)} unique articles")
+        return raw_articles, complete
+
+    def _newsapi_articles(self, queries):
+        # NewsAPI queries stay serialized and throttled inside a single pool worker
+        for query in queries:
             try:
-                headers = {'User-Agent': 'Mozilla/5.0 (compatible; NewsBot/1.0)'}
-                response = requests.get(site_url, headers=headers, timeout=10)
-                soup = BeautifulSoup(response.content, 'html.parser')
-
-                headlines = soup.find_all(['h1', 'h2', 'h3'], class_=lambda x: x and ('headline' in x.lower() or 'title' in x.lower()))
-                for headline in headlines[:5]:
-                    title_text = headline.get_text().strip()
-                    if len(title_text) > 20:
-                        desc_elem = headline.find_next(['p', 'div'], class_=lambda x: x and ('summary' in x.lower() or 'desc' in x.lower()))
-                        desc_text = desc_elem.get_text().strip()[:200] if desc_elem else title_text
-                        all_articles.append({
-                            'title': title_text,
-                            'description': desc_text,
-                            'source': site_url.split('/')[2],
-                            'url': site_url,
-                            'published': datetime.now().isoformat()
-                        })
+                url = "https://newsapi.org/v2/everything"
+                params = {
+                    'q': query,
+                    'language': 'en',
+                    'sortBy': 'publishedAt',
+                    'from': (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d'),
+                    'pageSize': 20,
+                    'apiKey': self.news_api_key
+                }
+                response = requests.get(url, params=params, timeout=10)
+                if response.status_code == 200:
+                    for article in response.json().get('articles', []):
+                        if article.get('title') and article.get('description'):
+                            yield Article(
+                                article['title'],
+                                article['description'],
+                                (article.get('source') or {}).get('name') or 'News API',
+                                article.get('url') or '',
+                                article.get('publishedAt') or ''
+                            )
+                time.sleep(0.5)
             except Exception as e:
-                print(f"Web scraping error for {site_url}: {e}")
+                print(f"News API error for query {query}: {e}")
 
-        filtered_articles = []
-        seen_titles = set()
-        
-        for article in all_articles:
-            title = article['title'].lower()
-            title_key = ' '.join(title.split()[:8])
-            
-            if title_key not in seen_titles and len(article['title']) > 15:
-                relevance_score = self.calculate_relevance_score(article)
-                if relevance_score >= 2:
-                    seen_titles.add(title_key)
-                    article['relevance_score'] = relevance_score
-                    filtered_articles.append(article)
-
-        filtered_articles.sort(key=lambda x: x['relevance_score'], reverse=True)
-        
-        print(f"Fetched {len(filtered_articles)} highly relevant articles")
+    def _rss_articles(self, feed_url):
+        try:
+            headers = {'User-Agent': 'Mozilla/5.0 (compatible; NewsBot/1.0)'}
+            response = requests.get(feed_url, headers=headers, timeout=10)
+            soup = BeautifulSoup(response.content, 'xml')
+            source = feed_url.split('/')[2]
+
+            for item in soup.find_all('item'):
+                title = item.find('title')
+                description = item.find('description')
+                pub_date = item.find('pubDate')
+                if title and description:
+                    desc_text = BeautifulSoup(description.text, 'html.parser').get_text().strip()[:300]
+                    yield Article(title.text.strip(), desc_text, source, '', pub_date.text if pub_date else '')
+        except Exception as e:
+            print(f"RSS feed error for {feed_url}: {e}")
+
+    def _site_articles(self, site_url):
+        try:
+            yield from self.scrape_news_site(site_url)
+        except Exception as e:
+            print(f"Web scraping error for {site_url}: {e}")
+
+    def filter_articles(self, raw_articles, profile):
+        # Only the best CANDIDATE_LIMIT articles are held per profile; ties keep their arrival order
+        candidates = []
+        relevant = 0
+
+        for index, article in enumerate(raw_articles):
+            relevance_score = self.calculate_relevance_score(article, profile)
+            if relevance_score < 2:
+                continue
+            relevant += 1
+            entry = (relevance_score, -index, article)
+            if len(candidates) < self.CANDIDATE_LIMIT:
+                heapq.heappush(candidates, entry)
+            elif entry[:2] > candidates[0][:2]:
+                heapq.heapreplace(candidates, entry)
+
+        filtered_articles = [
+            article.replace(relevance_score=relevance_score)
+            for relevance_score, _, article in sorted(candidates, key=lambda entry: entry[:2], reverse=True)
+        ]
+
+        print(f"{profile.name}: {relevant} highly relevant articles, kept {len(filtered_articles)}")
         return filtered_articles
 
-    def categorize_and_process_news(self, articles):
+    def scrape_news_site(self, site_url, limit=5):
+        headers = {'User-Agent': 'Mozilla/5.0 (compatible; NewsBot/1.0)'}
+        response = requests.get(site_url, headers=headers, timeout=10)
+        started = time.perf_counter()
+        articles = self.parse_news_site(site_url, response.content, limit)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        print(f"Parsed {len(articles)} headlines from {site_url} in {elapsed_ms:.1f} ms")
+        return articles
+
+    def parse_news_site(self, site_url, content, limit=5):
+        rules = self.site_selectors.get(urlparse(site_url).netloc)
+        articles = []
+
+        if rules:
+            try:
+                if rules.get('engine') == 'xpath':
+                    articles = self._extract_with_xpath(site_url, content, rules, limit)
+                else:
+                    articles = self._extract_with_css(site_url, content, rules, limit)
+            except Exception as e:
+                print(f"Selector extraction error for {site_url}: {e}")
+
         if not articles:
-            return "No news articles found to process."
+            articles = self._extract_generic(site_url, content, limit)
+        return articles
+
+    def _extract_with_css(self, site_url, content, rules, limit):
+        scope = rules.get('scope')
+        strainer = SoupStrainer(scope.get('name'), attrs=scope.get('attrs', {})) if scope else None
+        soup = BeautifulSoup(content, 'lxml', parse_only=strainer)
+
+        articles = []
+        for item in soup.select(rules['item']):
+            headline = item.select_one(rules['headline'])
+            title_text = headline.get_text(' ', strip=True) if headline else ''
+            if len(title_text) <= 20:
+                continue
+
+            summary = item.select_one(rules['summary']) if rules.get('summary') else None
+            link = item.select_one(rules['link']) if rules.get('link') else headline
+            if link is not None and link.name != 'a':
+                link = link.find('a', href=True)
+            published = item.select_one(rules['time']) if rules.get('time') else None
+
+            articles.append(self._site_article(
+                site_url,
+                title_text,
+                summary.get_text(' ', strip=True) if summary else '',
+                link.get('href') if link else '',
+                (published.get(rules.get('time_attr', 'datetime')) or published.get_text(strip=True)) if published else ''
+            ))
+            if len(articles) >= limit:
+                break
+        return articles
+
+    def _extract_with_xpath(self, site_url, content, rules, limit):
+        tree = lxml_html.fromstring(content)
+
+        articles = []
+        for item in tree.xpath(rules['item']):
+            title_text = self._xpath_text(item, rules['headline'])
+            if len(title_text) <= 20:
+                continue
+
+            articles.append(self._site_article(
+                site_url,
+                title_text,
+                self._xpath_text(item, rules.get('summary')),
+                self._xpath_text(item, rules.get('link')),
+                self._xpath_text(item, rules.get('time'))
+            ))
+            if len(articles) >= limit:
+                break
+        return articles
 
+    @staticmethod
+    def _xpath_text(node, expression):
+        if not expression:
+            return ''
+        result = node.xpath(expression)
+        if not result:
+            return ''
+        first = result[0]
+        if isinstance(first, str):
+            return first.strip()
+        return ' '.join(first.text_content().split())
+
+    def _extract_generic(self, site_url, content, limit):
+        markers = ('headline', 'title', 'summary', 'desc')
+        strainer = SoupStrainer(['h1', 'h2', 'h3', 'p', 'div'], class_=lambda x: x and any(m in x.lower() for m in markers))
+        soup = BeautifulSoup(content, 'lxml', parse_only=strainer)
+
+        articles = []
+        current = None
+        for elem in soup.find_all(['h1', 'h2', 'h3', 'p', 'div']):
+            classes = ' '.join(elem.get('class', [])).lower()
+            if elem.name in ('h1', 'h2', 'h3') and ('headline' in classes or 'title' in classes):
+                if len(articles) >= limit:
+                    break
+                current = None
+                title_text = elem.get_text(' ', strip=True)
+                if len(title_text) > 20:
+                    link = elem.find('a', href=True)
+                    current = self._site_article(site_url, title_text, '', link.get('href') if link else '', '')
+                    articles.append(current)
+            elif elem.name in ('p', 'div') and current and ('summary' in classes or 'desc' in classes):
+                current.description = elem.get_text(' ', strip=True)[:200]
+                current = None
+        return articles
+
+    @staticmethod
+    def _site_article(site_url, title_text, desc_text, link, published):
+        return Article(
+            title_text,
+            desc_text[:200] if desc_text else title_text,
+            urlparse(site_url).netloc,
+            urljoin(site_url, link) if link else site_url,
+            published or datetime.now().isoformat()
+        )
+
+    def categorize_and_process_news(self, articles, profile, current_date=None, deadline=None):
         categories = {
             'banking_finance': [],
             'economic': [],
@@ -393,30 +939,54 @@ Create questions that test knowledge of current banking and economic development
             'general': []
         }
 
-        for article in articles:
-            category = self.improved_categorization(article)
-            categories[category].append(article)
+        total = 0
+        for total, article in enumerate(articles, 1):
+            heap = categories[self.improved_categorization(article)]
+            entry = (article.relevance_score, -total, article)
+            if len(heap) < self.CATEGORY_LIMIT:
+                heapq.heappush(heap, entry)
+            else:
+                heapq.heappushpop(heap, entry)
+
+        if not total:
+            return "No news articles found to process."
 
         processed_content = []
-        current_date = datetime.now().strftime('%d %B %Y')
+        current_date = current_date or datetime.now().strftime('%d %B %Y')
+        call_times = []
 
-        for category_name, category_articles in categories.items():
-            if not category_articles:
+        for category_name, heap in categories.items():
+            if not heap:
                 continue
 
-            category_articles = sorted(category_articles, key=lambda x: x.get('relevance_score', 0), reverse=True)[:8]
+            category_articles = [entry[2] for entry in sorted(heap, reverse=True)]
+
+            if deadline:
+                remaining = deadline.remaining('ai')
+                estimate = sum(call_times) / len(call_times) if call_times else self.AI_CALL_ESTIMATE
+                if category_name in self.LOW_PRIORITY_CATEGORIES:
+                    if remaining < 2 * estimate:
+                        print(f"AI budget low ({remaining:.0f}s left), dropping {category_name}")
+                        continue
+                    if remaining < 3 * estimate:
+                        print(f"AI budget low ({remaining:.0f}s left), condensing {category_name}")
+                        category_articles = category_articles[:3]
+                elif processed_content and remaining < estimate:
+                    print(f"AI budget spent ({remaining:.0f}s left), skipping {category_name}")
+                    continue
 
             articles_text = "\n\n".join([
-                f"TITLE: {article['title']}\nDESCRIPTION: {article['description']}\nSOURCE: {article['source']}\nRELEVANCE_SCORE: {article.get('relevance_score', 'N/A')}"
+                f"TITLE: {article.title}\nDESCRIPTION: {article.description}\nSOURCE: {article.source}\nRELEVANCE_SCORE: {article.relevance_score}"
                 for article in category_articles
             ])
 
-            prompt = self.main_prompt_template.format(
+            prompt = profile.main_prompt_template.format(
                 current_date=current_date,
                 articles_text=articles_text
             )
 
             try:
+                call_started = time.time()
                 response = self.model.generate_content(
                     prompt,
                     generation_config=genai.types.GenerationConfig(
@@ -427,6 +997,8 @@ Create questions that test knowledge of current banking and economic development
                     )
                 )
 
+                call_times.append(time.time() - call_started)
+
                 if response and response.text:
                     category_title = category_name.replace('_', ' ').title()
                     processed_content.append(f"\n{category_title}\n\n{response.text.strip()}")
@@ -435,23 +1007,32 @@ Create questions that test knowledge of current banking and economic development
                 print(f"Gemini processing error for {category_name}: {e}")
 
         if processed_content:
-            final_content = f"IBPS RRB News - {current_date}\n"
-            final_content += f"Articles Processed: {len(articles)}\n\n"
+            final_content = f"{profile.title} News - {current_date}\n"
+            final_content += f"Articles Processed: {total}\n\n"
             final_content += "\n".join(processed_content)
 
-            try:
-                mcq_prompt = f"{final_content}\n\n{self.mcq_prompt_template}"
-                mcq_response = self.model.generate_content(
-                    mcq_prompt,
-                    generation_config=genai.types.GenerationConfig(
-                        temperature=0.2,
-                        max_output_tokens=2000
+            estimate = sum(call_times) / len(call_times) if call_times else self.AI_CALL_ESTIMATE
+            if deadline and deadline.remaining('ai') < estimate:
+                print("AI budget spent, skipping MCQs")
+            else:
+                try:
+                    normalized = self.fix_currency_symbols(final_content)
+                    # Without extractable facts, fall back to the full summaries rather than letting Gemini invent questions
+                    fact_sheet = self.build_fact_sheet(normalized) or normalized
+                    mcq_prompt = f"{fact_sheet}\n\n{profile.mcq_prompt_template}"
+                    mcq_response = self.model.generate_content(
+                        mcq_prompt,
+                        generation_config=genai.types.GenerationConfig(
+                            temperature=0.2,
+                            max_output_tokens=2000
+                        )
                     )
-                )
-                if mcq_response and mcq_response.text:
-                    final_content += f"\n\nPractice MCQs\n\n{mcq_response.text.strip()}"
-            except Exception as e:
-                print(f"MCQ generation error: {e}")
+                    if mcq_response and mcq_response.text:
+                        mcq_text = mcq_response.text.strip()
+                        final_content += f"\n\nPractice MCQs\n\n{mcq_text}"
+                        self.save_mcqs(self.parse_mcqs(self.fix_currency_symbols(mcq_text)), current_date, profile.name)
+                except Exception as e:
+                    print(f"MCQ generation error: {e}")
 
             final_content = self.fix_currency_symbols(final_content)
             
@@ -459,6 +1040,138 @@ Create questions that test knowledge of current banking and economic development
         else:
             return "Unable to process news articles with AI."
 
+    def build_fact_sheet(self, content):
+        facts = []
+        headline, summary = None, None
+        for line in content.split('\n') + ['HEADLINE:']:
+            line = line.strip()
+            if line.startswith(('HEADLINE:', 'GLOSSARY:')) or line in self.REPORT_SECTIONS:
+                summary_text = ' '.join(part for part in summary or [] if part)
+                if headline and summary_text:
+                    facts.append(f"- {headline}: {summary_text}")
+                headline, summary = None, None
+                if line.startswith('HEADLINE:'):
+                    headline = line[len('HEADLINE:'):].strip()
+            elif line.startswith('SUMMARY:') and headline:
+                summary = [line[len('SUMMARY:'):].strip()]
+            elif line and summary is not None:
+                summary.append(line)
+
+        if not facts:
+            return ''
+        title = content.split('\n', 1)[0]
+        return f"{title}\nNews summaries:\n" + "\n".join(facts)
+
+    def parse_mcqs(self, text):
+        questions = []
+        for block in re.split(r'(?m)^\s*Q\d+[.)]\s*', text)[1:]:
+            question_lines, options, answer, explanation = [], {}, None, ''
+            for line in block.split('\n'):
+                line = line.strip()
+                option_match = re.match(r'^([A-D])[).]\s*(.+)$', line)
+                answer_match = re.match(r'^Answer:\s*([A-D])\b\s*[-:]?\s*(.*)$', line, re.IGNORECASE)
+                if answer_match:
+                    answer = answer_match.group(1).upper()
+                    explanation = answer_match.group(2).strip()
+                    break
+                elif option_match:
+                    options[option_match.group(1)] = option_match.group(2).strip()
+                elif line and not options:
+                    question_lines.append(line)
+
+            if question_lines and len(options) == 4 and answer:
+                questions.append({
+                    'question': ' '.join(question_lines),
+                    'options': options,
+                    'answer': answer,
+                    'explanation': explanation
+                })
+        return questions
+
+    def save_mcqs(self, questions, report_date, profile_name, threshold=0.8):
+        if not questions:
+            return 0
+
+        conn = sqlite3.connect('news_reports.db', check_same_thread=False)
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT question, CASE answer WHEN 'A' THEN option_a WHEN 'B' THEN option_b
+                                         WHEN 'C' THEN option_c ELSE option_d END
+            FROM mcq_bank WHERE profile = ?
+        ''', (profile_name,))
+        documents = [f"{r[0]} {r[1] or ''}" for r in cursor.fetchall()]
+        existing_count = len(documents)
+        documents += [f"{q['question']} {q['options'][q['answer']]}" for q in questions]
+
+        matrix = self.story_clusterer.tfidf_matrix(documents)
+        similarity = (matrix[existing_count:] @ matrix.T).toarray()
+
+        accepted = []
+        for i, question in enumerate(questions):
+            compared = list(range(existing_count)) + [existing_count + j for j in accepted]
+            if compared and similarity[i, compared].max() >= threshold:
+                continue
+            accepted.append(i)
+            cursor.execute('''
+                INSERT INTO mcq_bank (profile, report_date, question, option_a, option_b, option_c, option_d, answer, explanation)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (profile_name, report_date, question['question'], question['options']['A'], question['options']['B'],
+                  question['options']['C'], question['options']['D'], question['answer'], question['explanation']))
+
+        conn.commit()
+        conn.close()
+        print(f"MCQ bank ({profile_name}): {len(accepted)} added, {len(questions) - len(accepted)} near-duplicates skipped")
+        return len(accepted)
+
+    def get_quiz(self, profile_name, mode='random', count=5):
+        conn = sqlite3.connect('news_reports.db', check_same_thread=False)
+        cursor = conn.cursor()
+        columns = 'id, report_date, question, option_a, option_b, option_c, option_d, answer, explanation'
+
+        if mode == 'spaced':
+            cursor.execute(f'''
+                SELECT {columns} FROM mcq_bank
+                WHERE profile = ? AND next_due <= CURRENT_TIMESTAMP
+                ORDER BY next_due LIMIT ?
+            ''', (profile_name, count))
+        else:
+            cursor.execute(f'''
+                SELECT {columns} FROM mcq_bank
+                WHERE id IN (SELECT id FROM mcq_bank WHERE profile = ? ORDER BY RANDOM() LIMIT ?)
+            ''', (profile_name, count))
+        rows = cursor.fetchall()
+
+        cursor.executemany('UPDATE mcq_bank SET times_served = times_served + 1 WHERE id = ?', [(r[0],) for r in rows])
+        conn.commit()
+        conn.close()
+
+        return [{
+            "id": r[0],
+            "date": r[1],
+            "question": r[2],
+            "options": {"A": r[3], "B": r[4], "C": r[5], "D": r[6]},
+            "answer": r[7],
+            "explanation": r[8]
+        } for r in rows]
+
+    def review_mcq(self, question_id, correct):
+        conn = sqlite3.connect('news_reports.db', check_same_thread=False)
+        cursor = conn.cursor()
+        cursor.execute('SELECT box FROM mcq_bank WHERE id = ?', (question_id,))
+        row = cursor.fetchone()
+        if not row:
+            conn.close()
+            return None
+
+        box = min(row[0] + 1, 6) if correct else 0
+        cursor.execute(
+            "UPDATE mcq_bank SET box = ?, next_due = datetime('now', ?) WHERE id = ?",
+            (box, f'+{2 ** box} days', question_id)
+        )
+        conn.commit()
+        conn.close()
+        return {"id": question_id, "box": box, "next_review_days": 2 ** box}
+
     def fix_currency_symbols(self, content):
         content = re.sub(r'₹(\d+(?:,\d+)*(?:\.\d+)?)\s*(crore|lakh|billion|million|thousand)', r'Rs.\1 \2', content)
         content = re.sub(r'\bI(\d+(?:,\d+)*(?:\.\d+)?)\s*(crore|lakh|billion|million|thousand)', r'Rs.\1 \2', content)
@@ -478,7 +1191,8 @@ Create questions that test knowledge of current banking and economic development
         
         return content
 
-    def create_pdf(self, content, date_str):
+    @classmethod
+    def create_pdf(cls, content, date_str):
         try:
             buffer = io.BytesIO()
             doc = SimpleDocTemplate(buffer, pagesize=letter)
@@ -528,9 +1242,9 @@ Create questions that test knowledge of current banking and economic development
                 line = line.strip()
                 if not line:
                     story.append(Spacer(1, 6))
-                elif line.startswith('IBPS RRB News -'):
+                elif cls.REPORT_TITLE_PATTERN.match(line):
                     story.append(Paragraph(line, main_title_style))
-                elif line in ['Banking Finance', 'Economic', 'Government Schemes', 'International', 'Sports Awards', 'General', 'Practice MCQs']:
+                elif line in cls.REPORT_SECTIONS:
                     story.append(Paragraph(line, category_title_style))
                 elif line.startswith('HEADLINE:'):
                     clean_line = line.replace('HEADLINE:', '').strip()
@@ -568,14 +1282,25 @@ Create questions that test knowledge of current banking and economic development
             print(f"PDF creation error: {e}")
             return None
 
-    def send_email(self, content, pdf_data, date_str):
+    @classmethod
+    def write_pdf(cls, content, date_str, path):
+        pdf_data = cls.create_pdf(content, date_str)
+        if not pdf_data:
+            return None
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as file:
+            file.write(pdf_data)
+        return path
+
+    def send_email(self, content, pdf_data, date_str, profile, timeout=None):
         try:
             msg = MIMEMultipart()
             msg['From'] = self.email_user
-            msg['To'] = self.recipient
-            msg['Subject'] = f"IBPS RRB News - {date_str}"
+            recipients = profile.recipients or [self.recipient]
+            msg['To'] = ', '.join(recipients)
+            msg['Subject'] = f"{profile.title} News - {date_str}"
 
-            email_body = self.email_template.format(date_str=date_str) if self.email_template else f"""Dear IBPS RRB Aspirant,
+            email_body = profile.email_template.format(date_str=date_str) if profile.email_template else f"""Dear {profile.title} Aspirant,
 
 Your daily banking news summary for {date_str} is ready.
 
@@ -587,10 +1312,10 @@ Enhanced features:
 • High-quality relevant articles only
 • Practice MCQs with beginner-friendly explanations
 
-Perfect for your IBPS RRB exam preparation!
+Perfect for your {profile.title} exam preparation!
 
 Best wishes,
-IBPS RRB Study Assistant"""
+{profile.title} Study Assistant"""
 
             msg.attach(MIMEText(email_body, 'plain'))
 
@@ -603,14 +1328,14 @@ IBPS RRB Study Assistant"""
                 encoders.encode_base64(part)
                 part.add_header(
                     'Content-Disposition',
-                    f'attachment; filename=IBPS_RRB_News_{date_str.replace(" ", "_")}.pdf'
+                    f'attachment; filename={profile.title.replace(" ", "_")}_News_{date_str.replace(" ", "_")}.pdf'
                 )
                 msg.attach(part)
 
-            server = smtplib.SMTP('smtp.gmail.com', 587)
+            server = smtplib.SMTP('smtp.gmail.com', 587, timeout=timeout) if timeout else smtplib.SMTP('smtp.gmail.com', 587)
             server.starttls()
             server.login(self.email_user, self.email_pass)
-            server.sendmail(self.email_user, self.recipient, msg.as_string())
+            server.sendmail(self.email_user, recipients, msg.as_string())
             server.quit()
             return True
 
@@ -618,68 +1343,397 @@ IBPS RRB Study Assistant"""
             print(f"Email sending error: {e}")
             return False
 
-    def generate_daily_report(self, force=False):
+    def list_reports(self, profile_name, before=None, limit=10):
+        conn = sqlite3.connect('news_reports.db', check_same_thread=False)
+        cursor = conn.cursor()
+        if before:
+            cursor.execute('''
+                SELECT id, date, articles_count, created_at FROM daily_reports
+                WHERE profile = ? AND id < ? ORDER BY id DESC LIMIT ?
+            ''', (profile_name, before, limit))
+        else:
+            cursor.execute('''
+                SELECT id, date, articles_count, created_at FROM daily_reports
+                WHERE profile = ? ORDER BY id DESC LIMIT ?
+            ''', (profile_name, limit))
+        reports = cursor.fetchall()
+        conn.close()
+
+        return {
+            "reports": [{"id": r[0], "date": r[1], "articles": r[2], "created": r[3]} for r in reports],
+            "next_before": reports[-1][0] if len(reports) == limit else None
+        }
+
+    def report_version(self, profile_name, date_str=None):
+        # Cached report bodies are checked against this on every hit, so rewrites by other processes (replay) are picked up
+        conn = sqlite3.connect('news_reports.db', check_same_thread=False)
+        cursor = conn.cursor()
+        if date_str:
+            cursor.execute('SELECT id, updated_at FROM daily_reports WHERE profile = ? AND date = ?', (profile_name, date_str))
+        else:
+            cursor.execute('SELECT COUNT(*), MAX(id), MAX(updated_at) FROM daily_reports WHERE profile = ?', (profile_name,))
+        version = cursor.fetchone()
+        conn.close()
+        return version
+
+    def get_report(self, profile_name, date_str):
+        conn = sqlite3.connect('news_reports.db', check_same_thread=False)
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT date, content, articles_count, created_at FROM daily_reports
+            WHERE profile = ? AND date = ?
+        ''', (profile_name, date_str))
+        row = cursor.fetchone()
+        conn.close()
+
+        if not row:
+            return None
+        return {"date": row[0], "content": row[1], "articles": row[2], "created": row[3]}
+
+    def parse_report(self, content):
+        report = {"title": "", "categories": [], "mcqs": []}
+
+        mcq_start = content.find('\nPractice MCQs\n')
+        if mcq_start >= 0:
+            report["mcqs"] = self.parse_mcqs(content[mcq_start:])
+            content = content[:mcq_start]
+
+        category = None
+        article = None
+        for line in content.split('\n'):
+            line = line.strip()
+            if self.REPORT_TITLE_PATTERN.match(line):
+                report["title"] = line
+            elif line in self.REPORT_SECTIONS:
+                category = {"name": line, "articles": []}
+                report["categories"].append(category)
+                article = None
+            elif line.startswith('HEADLINE:') and category is not None:
+                article = {"headline": line.replace('HEADLINE:', '').strip(), "summary": "", "glossary": []}
+                category["articles"].append(article)
+            elif line.startswith('SUMMARY:') and article is not None:
+                article["summary"] = line.replace('SUMMARY:', '').strip()
+            elif line.startswith('•') and article is not None:
+                article["glossary"].append(line.lstrip('•').strip())
+
+        return report
+
+    def render_report_html(self, report):
+        esc = html_lib.escape
+        parts = [
+            '<!DOCTYPE html><html><head><meta charset="utf-8">',
+            '<meta name="viewport" content="width=device-width, initial-scale=1">',
+            f'<title>{esc(report["title"])}</title>',
+            '<style>body{font-family:Arial,sans-serif;max-width:800px;margin:0 auto;padding:16px;line-height:1.5}'
+            'h2{color:#1a365d}h3{color:#2d3748;margin-bottom:4px}ul{color:#4a5568}</style>',
+            f'</head><body><h1>{esc(report["title"])}</h1>'
+        ]
+        for category in report["categories"]:
+            parts.append(f'<h2>{esc(category["name"])}</h2>')
+            for article in category["articles"]:
+                parts.append(f'<h3>{esc(article["headline"])}</h3><p>{esc(article["summary"])}</p>')
+                if article["glossary"]:
+                    parts.append('<ul>' + ''.join(f'<li>{esc(term)}</li>' for term in article["glossary"]) + '</ul>')
+        if report["mcqs"]:
+            parts.append('<h2>Practice MCQs</h2>')
+            for number, mcq in enumerate(report["mcqs"], 1):
+                options = ''.join(f'<li>{letter}) {esc(text)}</li>' for letter, text in mcq["options"].items())
+                parts.append(
+                    f'<p><strong>Q{number}. {esc(mcq["question"])}</strong></p><ul>{options}</ul>'
+                    f'<details><summary>Answer</summary>{esc(mcq["answer"])} - {esc(mcq["explanation"])}</details>'
+                )
+        parts.append('</body></html>')
+        return ''.join(parts)
+
+    def report_exists(self, profile_name, date_str):
+        conn = sqlite3.connect('news_reports.db', check_same_thread=False)
+        cursor = conn.cursor()
+        cursor.execute('SELECT id FROM daily_reports WHERE profile = ? AND date = ?', (profile_name, date_str))
+        exists = cursor.fetchone() is not None
+        conn.close()
+        return exists
+
+    def generate_daily_report(self, force=False, profile_names=None, scheduled=False):
         ist_tz = pytz.timezone('Asia/Kolkata')
-        date_str = datetime.now(ist_tz).strftime('%d %B %Y')
+        now = datetime.now(ist_tz)
+        date_str = now.strftime('%d %B %Y')
+        names = profile_names or list(self.profiles)
+
+        unknown = [name for name in names if name not in self.profiles]
+        if unknown:
+            return {"status": "error", "message": f"Unknown profile: {', '.join(unknown)}"}
 
         try:
             print(f"Starting news processing for {date_str}")
 
-            if not force:
-                conn = sqlite3.connect('news_reports.db', check_same_thread=False)
-                cursor = conn.cursor()
-                cursor.execute('SELECT id FROM daily_reports WHERE date = ?', (date_str,))
-                if cursor.fetchone():
-                    print(f"Report already generated for {date_str}")
-                    conn.close()
-                    return {"status": "already_exists", "date": date_str}
-                conn.close()
-            else:
+            results = {}
+            pending = []
+            for name in names:
+                if not force and self.report_exists(name, date_str):
+                    print(f"Report already generated for {name} on {date_str}")
+                    results[name] = {"status": "already_exists", "date": date_str}
+                else:
+                    pending.append(name)
+
+            if force:
                 print(f"Force generating report for {date_str}")
 
-            articles = self.fetch_real_news()
+            if pending:
+                deadlines = self.run_deadlines(pending, now, scheduled)
+                for deadline in deadlines.values():
+                    deadline.start('fetch')
+
+                # Only scheduled runs reuse the prefetched crawl; manual and forced runs always fetch fresh
+                if scheduled:
+                    max_age = max([3600] + [self.profiles[name].prefetch_minutes * 60 + 900 for name in pending])
+                else:
+                    max_age = 0
+                # A late start still gets a short fetch window, borrowed from the later stages, rather than none at all
+                fetch_timeout = max(min(deadline.remaining('fetch') for deadline in deadlines.values()), self.FETCH_MIN_SECONDS)
+                raw_articles = self.fetch_raw_articles(max_age=max_age, timeout=fetch_timeout)
+
+                for name in pending:
+                    results[name] = self.generate_profile_report(self.profiles[name], raw_articles, date_str, force, deadlines[name])
+
+            return self.summarize_results(results, date_str, force)
+
+        except Exception as e:
+            print(f"Report generation error: {e}")
+            return {"status": "error", "message": str(e)}
+
+    def generate_profile_report(self, profile, raw_articles, date_str, force=False, deadline=None):
+        deadline = deadline or RunDeadline(profile.budgets)
+        try:
+            deadline.start('ai')
+            articles = self.filter_articles(raw_articles, profile)
             if not articles:
-                print("No relevant articles found")
+                print(f"No relevant articles found for {profile.name}")
                 return {"status": "error", "message": "No relevant news articles found"}
 
-            processed_content = self.categorize_and_process_news(articles)
+            self.store_articles(profile.name, date_str, articles)
+
+            stories = self.story_clusterer.cluster(articles)
+            print(f"Clustered {len(articles)} articles into {len(stories)} stories")
 
-            pdf_data = self.create_pdf(processed_content, date_str)
+            processed_content = self.categorize_and_process_news(stories, profile, date_str, deadline=deadline)
+
+            deadline.start('render')
+            if deadline.remaining('render') > 0:
+                pdf_data = self.create_pdf(processed_content, date_str)
+            else:
+                print(f"Render budget spent for {profile.name}, sending without PDF")
+                pdf_data = None
 
-            email_sent = self.send_email(processed_content, pdf_data, date_str)
+            deadline.start('send')
+            email_sent = self.send_email(processed_content, pdf_data, date_str, profile, timeout=profile.budgets['send'])
 
             conn = sqlite3.connect('news_reports.db', check_same_thread=False)
             cursor = conn.cursor()
             
             if force:
                 cursor.execute('''
-                    INSERT OR REPLACE INTO daily_reports (date, content, articles_count)
-                    VALUES (?, ?, ?)
-                ''', (date_str, processed_content, len(articles)))
+                    INSERT OR REPLACE INTO daily_reports (profile, date, content, articles_count, updated_at)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (profile.name, date_str, processed_content, len(articles), time.time()))
             else:
                 cursor.execute('''
-                    INSERT INTO daily_reports (date, content, articles_count)
-                    VALUES (?, ?, ?)
-                ''', (date_str, processed_content, len(articles)))
+                    INSERT INTO daily_reports (profile, date, content, articles_count, updated_at)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (profile.name, date_str, processed_content, len(articles), time.time()))
             
             conn.commit()
             conn.close()
+            self.report_cache.invalidate(profile.name, date_str)
 
             status_text = "Force generated" if force else "Generated"
-            print(f"report {status_text} successfully - Articles: {len(articles)}, Email: {'✓' if email_sent else '✗'}")
+            print(f"{profile.name} report {status_text} successfully - Articles: {len(articles)}, Email: {'✓' if email_sent else '✗'}")
 
             return {
                 "status": "success",
                 "date": date_str,
                 "articles_processed": len(articles),
                 "email_sent": email_sent,
-                "forced": force
+                "forced": force,
+                "on_time": deadline.on_time()
             }
 
         except Exception as e:
-            print(f"Report generation error: {e}")
+            print(f"Report generation error for {profile.name}: {e}")
             return {"status": "error", "message": str(e)}
 
+    def store_articles(self, profile_name, date_str, articles):
+        conn = sqlite3.connect('news_reports.db', check_same_thread=False)
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT OR REPLACE INTO report_articles (profile, date, articles)
+            VALUES (?, ?, ?)
+        ''', (profile_name, date_str, json.dumps([article.to_dict() for article in articles], ensure_ascii=False)))
+        conn.commit()
+        conn.close()
+
+    def replay_reports(self, start_date, end_date, stages, profile_names=None, run_id=None, resume=False, workers=None, output_dir='replay_output'):
+        stages = [stage for stage in self.REPLAY_STAGES if stage in stages]
+        names = profile_names or list(self.profiles)
+
+        unknown = [name for name in names if name not in self.profiles]
+        if unknown:
+            return {"status": "error", "message": f"Unknown profile: {', '.join(unknown)}"}
+        if not stages:
+            return {"status": "error", "message": f"stages must be chosen from {', '.join(self.REPLAY_STAGES)}"}
+
+        start = datetime.strptime(start_date, '%Y-%m-%d')
+        end = datetime.strptime(end_date, '%Y-%m-%d')
+        if end < start:
+            return {"status": "error", "message": "End date is before start date"}
+
+        # Resuming is opt-in: without an explicit run_id or resume=True the checkpoints are cleared and every day is redone
+        resume = resume or bool(run_id)
+        run_id = run_id or hashlib.sha1(json.dumps([start_date, end_date, stages, names]).encode('utf-8')).hexdigest()[:12]
+        print(f"Replay {run_id} ({'resuming' if resume else 'fresh'}): {start_date} to {end_date}, stages: {', '.join(stages)}")
+        started = time.perf_counter()
+
+        conn = sqlite3.connect('news_reports.db', check_same_thread=False)
+        cursor = conn.cursor()
+        if not resume:
+            cursor.execute('DELETE FROM replay_checkpoints WHERE run_id = ?', (run_id,))
+            conn.commit()
+        cursor.execute('SELECT profile, date, stage FROM replay_checkpoints WHERE run_id = ?', (run_id,))
+        done = set(cursor.fetchall())
+
+        completed = {stage: 0 for stage in stages}
+        skipped = 0
+        pdf_jobs = []
+
+        day = start
+        while day <= end:
+            date_str = day.strftime('%d %B %Y')
+            for name in names:
+                profile = self.profiles[name]
+                cursor.execute('SELECT content FROM daily_reports WHERE profile = ? AND date = ?', (name, date_str))
+                row = cursor.fetchone()
+                content = row[0] if row else None
+
+                for stage in stages:
+                    if (name, date_str, stage) in done:
+                        skipped += 1
+                        continue
+
+                    if stage == 'pdf':
+                        if content:
+                            filename = f'{profile.title.replace(" ", "_")}_News_{date_str.replace(" ", "_")}.pdf'
+                            pdf_jobs.append((name, date_str, content, os.path.join(output_dir, name, filename)))
+                        continue
+
+                    try:
+                        content, ran = self.replay_content_stage(cursor, stage, profile, date_str, content)
+                    except Exception as e:
+                        print(f"Replay {stage} error for {name} on {date_str}: {e}")
+                        break
+                    if ran:
+                        cursor.execute('''
+                            INSERT OR IGNORE INTO replay_checkpoints (run_id, profile, date, stage)
+                            VALUES (?, ?, ?, ?)
+                        ''', (run_id, name, date_str, stage))
+                        conn.commit()
+                        completed[stage] += 1
+            day += timedelta(days=1)
+
+        if pdf_jobs:
+            mp_context = multiprocessing.get_context('fork') if 'fork' in multiprocessing.get_all_start_methods() else None
+            with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as executor:
+                futures = {
+                    executor.submit(NewsProcessor.write_pdf, content, date_str, path): (name, date_str)
+                    for name, date_str, content, path in pdf_jobs
+                }
+                for future in as_completed(futures):
+                    name, date_str = futures[future]
+                    try:
+                        path = future.result()
+                    except Exception as e:
+                        print(f"Replay pdf error for {name} on {date_str}: {e}")
+                        continue
+                    if path:
+                        cursor.execute('''
+                            INSERT OR IGNORE INTO replay_checkpoints (run_id, profile, date, stage)
+                            VALUES (?, ?, ?, ?)
+                        ''', (run_id, name, date_str, 'pdf'))
+                        conn.commit()
+                        completed['pdf'] += 1
+
+        conn.close()
+        elapsed = time.perf_counter() - started
+        print(f"Replay {run_id} finished in {elapsed:.1f}s - {completed}, {skipped} already done")
+
+        return {
+            "status": "success",
+            "run_id": run_id,
+            "completed": completed,
+            "skipped": skipped,
+            "elapsed_seconds": round(elapsed, 2)
+        }
+
+    def replay_content_stage(self, cursor, stage, profile, date_str, content):
+        if stage == 'prompt':
+            cursor.execute('SELECT articles FROM report_articles WHERE profile = ? AND date = ?', (profile.name, date_str))
+            row = cursor.fetchone()
+            if not row:
+                return content, False
+
+            articles = [Article.from_dict(data) for data in json.loads(row[0])]
+            stories = self.story_clusterer.cluster(articles)
+            new_content = self.categorize_and_process_news(stories, profile, date_str)
+            if not self.REPORT_TITLE_PATTERN.match(new_content.split('\n', 1)[0]):
+                raise ValueError(new_content)
+
+            cursor.execute('''
+                UPDATE daily_reports SET content = ?, updated_at = ? WHERE profile = ? AND date = ?
+            ''', (new_content, time.time(), profile.name, date_str))
+            if cursor.rowcount == 0:
+                cursor.execute('''
+                    INSERT INTO daily_reports (profile, date, content, articles_count, updated_at)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (profile.name, date_str, new_content, len(articles), time.time()))
+            return new_content, True
+
+        if content is None:
+            return None, False
+
+        if stage == 'normalize':
+            new_content = self.fix_currency_symbols(content)
+            cursor.execute('''
+                UPDATE daily_reports SET content = ?, updated_at = ? WHERE profile = ? AND date = ?
+            ''', (new_content, time.time(), profile.name, date_str))
+            return new_content, True
+
+        if stage == 'index':
+            self.save_mcqs(self.parse_report(content)["mcqs"], date_str, profile.name)
+            return content, True
+
+        raise ValueError(f"Unknown replay stage: {stage}")
+
+    def summarize_results(self, results, date_str, force):
+        statuses = [result["status"] for result in results.values()]
+        if "success" in statuses:
+            status = "success"
+        elif all(s == "already_exists" for s in statuses):
+            status = "already_exists"
+        else:
+            status = "error"
+
+        summary = {
+            "status": status,
+            "date": date_str,
+            "articles_processed": sum(r.get("articles_processed", 0) for r in results.values()),
+            "email_sent": all(r["email_sent"] for r in results.values() if r["status"] == "success"),
+            "forced": force,
+            "profiles": results
+        }
+
+        errors = [f"{name}: {r['message']}" for name, r in results.items() if r["status"] == "error"]
+        if errors:
+            summary["message"] = "; ".join(errors)
+        return summary
+
 try:
     processor = NewsProcessor()
     print("News processor initialized successfully")
@@ -693,6 +1747,11 @@ def dashboard():
         return "System not configured properly. Check environment variables."
     
     ist_time = datetime.now(pytz.timezone('Asia/Kolkata'))
+    profiles_text = ', '.join(
+        f"{p.title} (starts {p.schedule[0]:02d}:{p.schedule[1]:02d}"
+        + (f", due {p.deadline[0]:02d}:{p.deadline[1]:02d}" if p.deadline else "") + " IST)"
+        for p in processor.profiles.values()
+    )
     html = f"""
     <!DOCTYPE html>
     <html>
@@ -730,7 +1789,7 @@ def dashboard():
                 • RSS Feeds: {len(processor.rss_feeds)} loaded<br>
                 • News Sites: {len(processor.news_sites)} loaded<br>
                 • Keywords: {len(processor.relevant_keywords)} loaded<br>
-                • Scheduled: 8:00 PM IST daily
+                • Profiles: {profiles_text}
             </div>
             
             <div class="button-group">
@@ -799,7 +1858,8 @@ def generate_report():
     if not processor:
         return jsonify({"status": "error", "message": "System not initialized"})
     
-    result = processor.generate_daily_report(force=False)
+    profile = request.args.get('profile')
+    result = processor.generate_daily_report(force=False, profile_names=[profile] if profile else None)
     return jsonify(result)
 
 @app.route('/force-generate')
@@ -807,7 +1867,8 @@ def force_generate_report():
     if not processor:
         return jsonify({"status": "error", "message": "System not initialized"})
     
-    result = processor.generate_daily_report(force=True)
+    profile = request.args.get('profile')
+    result = processor.generate_daily_report(force=True, profile_names=[profile] if profile else None)
     return jsonify(result)
 
 @app.route('/status')
@@ -817,26 +1878,172 @@ def status():
     
     conn = sqlite3.connect('news_reports.db', check_same_thread=False)
     cursor = conn.cursor()
-    cursor.execute('SELECT date, articles_count, created_at FROM daily_reports ORDER BY created_at DESC LIMIT 10')
+    cursor.execute('SELECT profile, date, articles_count, created_at FROM daily_reports ORDER BY created_at DESC LIMIT 10')
     reports = cursor.fetchall()
     conn.close()
     
     return jsonify({
         "status": "active",
-        "recent_reports": [{"date": r[0], "articles": r[1], "created": r[2]} for r in reports]
+        "recent_reports": [{"profile": r[0], "date": r[1], "articles": r[2], "created": r[3]} for r in reports]
     })
 
+@app.route('/quiz')
+def quiz():
+    if not processor:
+        return jsonify({"status": "error", "message": "System not initialized"})
+
+    mode = request.args.get('mode', 'random')
+    if mode not in ('random', 'spaced'):
+        return jsonify({"status": "error", "message": "mode must be 'random' or 'spaced'"}), 400
+    count = min(max(request.args.get('count', 5, type=int), 1), 50)
+
+    profile = request.args.get('profile', processor.default_profile)
+    if profile not in processor.profiles:
+        return jsonify({"status": "error", "message": f"Unknown profile: {profile}"}), 400
+    questions = processor.get_quiz(profile, mode, count)
+    return jsonify({"status": "success", "profile": profile, "mode": mode, "questions": questions})
+
+@app.route('/quiz/<int:question_id>/review', methods=['POST'])
+def review_quiz_question(question_id):
+    if not processor:
+        return jsonify({"status": "error", "message": "System not initialized"})
+
+    payload = request.get_json(silent=True) or {}
+    result = processor.review_mcq(question_id, bool(payload.get('correct')))
+    if not result:
+        return jsonify({"status": "error", "message": "Question not found"}), 404
+    return jsonify({"status": "success", **result})
+
+def cached_response(key, build, version, max_age):
+    entry = processor.report_cache.get(key)
+    if entry is None or entry["version"] != version:
+        built = build()
+        if built is None:
+            return jsonify({"status": "error", "message": "Report not found"}), 404
+        body, mimetype = built
+        entry = {"body": body, "mimetype": mimetype, "etag": hashlib.sha1(body).hexdigest(), "version": version}
+        processor.report_cache.put(key, entry)
+
+    if request.if_none_match.contains_weak(entry["etag"]):
+        response = app.response_class(status=304)
+    else:
+        encoding = None
+        if len(entry["body"]) > 500:
+            if 'br' in request.accept_encodings:
+                encoding = 'br'
+            elif 'gzip' in request.accept_encodings:
+                encoding = 'gzip'
+
+        if encoding:
+            if encoding not in entry:
+                entry[encoding] = brotli.compress(entry["body"]) if encoding == 'br' else gzip.compress(entry["body"])
+            response = app.response_class(entry[encoding], mimetype=entry["mimetype"])
+            response.headers['Content-Encoding'] = encoding
+        else:
+            response = app.response_class(entry["body"], mimetype=entry["mimetype"])
+
+    response.set_etag(entry["etag"], weak=True)
+    # max_age=0 makes clients revalidate with the ETag every time instead of reusing a possibly regenerated report
+    response.headers['Cache-Control'] = f'public, max-age={max_age}' if max_age else 'no-cache'
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
+@app.route('/reports')
+def reports():
+    if not processor:
+        return jsonify({"status": "error", "message": "System not initialized"})
+
+    profile = request.args.get('profile', processor.default_profile)
+    if profile not in processor.profiles:
+        return jsonify({"status": "error", "message": f"Unknown profile: {profile}"}), 400
+    before = request.args.get('before', type=int)
+    limit = min(max(request.args.get('limit', 10, type=int), 1), 100)
+
+    def build():
+        listing = processor.list_reports(profile, before, limit)
+        return json.dumps(listing).encode('utf-8'), 'application/json'
+
+    return cached_response(('list', profile, before, limit), build, processor.report_version(profile), max_age=60)
+
+@app.route('/reports/<date>')
+def report_detail(date):
+    if not processor:
+        return jsonify({"status": "error", "message": "System not initialized"})
+
+    profile = request.args.get('profile', processor.default_profile)
+    if profile not in processor.profiles:
+        return jsonify({"status": "error", "message": f"Unknown profile: {profile}"}), 400
+    fmt = request.args.get('format', 'json')
+    if fmt not in ('text', 'json', 'html'):
+        return jsonify({"status": "error", "message": "format must be 'text', 'json' or 'html'"}), 400
+
+    try:
+        date_str = datetime.strptime(date, '%Y-%m-%d').strftime('%d %B %Y')
+    except ValueError:
+        date_str = date
+
+    def build():
+        report = processor.get_report(profile, date_str)
+        if not report:
+            return None
+        if fmt == 'text':
+            return report["content"].encode('utf-8'), 'text/plain'
+        parsed = processor.parse_report(report["content"])
+        if fmt == 'html':
+            return processor.render_report_html(parsed).encode('utf-8'), 'text/html'
+        parsed.update(date=report["date"], articles=report["articles"], created=report["created"])
+        return json.dumps(parsed, ensure_ascii=False).encode('utf-8'), 'application/json'
+
+    return cached_response((profile, date_str, fmt), build, processor.report_version(profile, date_str), max_age=0)
+
 scheduler = BackgroundScheduler()
-scheduler.add_job(
-    func=lambda: processor.generate_daily_report() if processor else None,
-    trigger=CronTrigger(hour=20, minute=0, timezone=pytz.timezone('Asia/Kolkata')),
-    id='daily_news_report',
-    name='Generate daily IBPS RRB news report',
-    replace_existing=True
-)
+if processor:
+    for (hour, minute), profile_names in processor.schedule_slots().items():
+        scheduler.add_job(
+            func=processor.generate_daily_report,
+            kwargs={'profile_names': profile_names, 'scheduled': True},
+            trigger=CronTrigger(hour=hour, minute=minute, timezone=pytz.timezone('Asia/Kolkata')),
+            id=f'daily_news_report_{hour:02d}{minute:02d}',
+            name=f"Generate daily news reports for {', '.join(profile_names)}",
+            replace_existing=True
+        )
+    for hour, minute in processor.prefetch_slots():
+        scheduler.add_job(
+            func=processor.prefetch_articles,
+            trigger=CronTrigger(hour=hour, minute=minute, timezone=pytz.timezone('Asia/Kolkata')),
+            id=f'prefetch_articles_{hour:02d}{minute:02d}',
+            name='Prefetch articles ahead of scheduled reports',
+            replace_existing=True
+        )
 
 scheduler.start()
 
+def run_replay(argv):
+    parser = argparse.ArgumentParser(prog='app.py replay', description='Rebuild stored reports over a date range')
+    parser.add_argument('--from', dest='start_date', required=True, help='First date to replay (YYYY-MM-DD)')
+    parser.add_argument('--to', dest='end_date', required=True, help='Last date to replay (YYYY-MM-DD)')
+    parser.add_argument('--stages', default='normalize,pdf', help=f"Comma-separated stages: {', '.join(NewsProcessor.REPLAY_STAGES)}")
+    parser.add_argument('--profile', action='append', dest='profiles', help='Profile to replay (repeatable, default: all)')
+    parser.add_argument('--run-id', help='Checkpoint id; reuse it to resume an interrupted run')
+    parser.add_argument('--resume', action='store_true', help='Skip days already checkpointed by the last run with the same arguments')
+    parser.add_argument('--workers', type=int, help='Processes for PDF rendering (default: CPU count)')
+    parser.add_argument('--output-dir', default='replay_output', help='Directory for rendered PDFs')
+    args = parser.parse_args(argv)
+
+    result = processor.replay_reports(
+        args.start_date, args.end_date, args.stages.split(','),
+        profile_names=args.profiles, run_id=args.run_id, resume=args.resume,
+        workers=args.workers, output_dir=args.output_dir
+    )
+    print(json.dumps(result, indent=2))
+    return 0 if result["status"] == "success" else 1
+
+if __name__ == '__main__' and sys.argv[1:2] == ['replay']:
+    scheduler.shutdown(wait=False)
+    if not processor:
+        sys.exit("System not configured properly. Check environment variables.")
+    sys.exit(run_replay(sys.argv[2:]))
+
 if __name__ == '__main__':
     print("News Generator starting...")
     print(f"Loaded {len(processor.news_queries) if processor else 0} news queries")
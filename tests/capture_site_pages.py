@@ -0,0 +1,49 @@
+"""Save the live page of every news site that has rules in config/site_selectors.json.
+
+Run from anywhere before changing a site's rules:
+
+    python tests/capture_site_pages.py
+
+Pages land in tests/fixtures/sites/live/<site>.html, where
+test_site_scraping.py checks the rules against them.
+"""
+import json
+import os
+import sys
+from urllib.parse import urlparse
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LIVE_FIXTURES = os.path.join(ROOT, 'tests', 'fixtures', 'sites', 'live')
+
+
+def main():
+    with open(os.path.join(ROOT, 'config', 'site_selectors.json'), encoding='utf-8') as file:
+        hosts = set(json.load(file))
+    with open(os.path.join(ROOT, 'config', 'news_sites.txt'), encoding='utf-8') as file:
+        site_urls = [line.strip() for line in file if line.strip() and not line.startswith('#')]
+
+    os.makedirs(LIVE_FIXTURES, exist_ok=True)
+    headers = {'User-Agent': 'Mozilla/5.0 (compatible; NewsBot/1.0)'}
+    failed = 0
+    for site_url in site_urls:
+        host = urlparse(site_url).netloc
+        if host not in hosts:
+            continue
+        name = host.split('.')[-2]
+        try:
+            response = requests.get(site_url, headers=headers, timeout=15)
+            response.raise_for_status()
+        except Exception as e:
+            print(f"{name}: {e}")
+            failed += 1
+            continue
+        with open(os.path.join(LIVE_FIXTURES, f'{name}.html'), 'wb') as file:
+            file.write(response.content)
+        print(f"{name}: saved {len(response.content)} bytes from {site_url}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,32 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def pytest_addoption(parser):
+    parser.addoption('--benchmark', action='store_true', help='Run wall-clock benchmarks')
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'benchmark: wall-clock timing check, skipped unless --benchmark is given')
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption('--benchmark'):
+        return
+    skip = pytest.mark.skip(reason='benchmark, run with --benchmark')
+    for item in items:
+        if 'benchmark' in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope='session', autouse=True)
+def stop_scheduler():
+    yield
+    import app
+    if app.scheduler.running:
+        app.scheduler.shutdown(wait=False)
@@ -0,0 +1,90 @@
+import os
+import time
+from datetime import datetime
+
+import pytest
+import pytz
+
+from app import ExamProfile, NewsProcessor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IST = pytz.timezone('Asia/Kolkata')
+
+
+def make_processor(settings):
+    news_processor = NewsProcessor.__new__(NewsProcessor)
+    news_processor.profiles = {
+        name: ExamProfile(name, dict(profile_settings, config_dir=os.path.join(ROOT, 'config')))
+        for name, profile_settings in settings.items()
+    }
+    news_processor._share_deadline_slots()
+    return news_processor
+
+
+@pytest.fixture
+def two_profiles():
+    return make_processor({
+        'ibps_rrb': {'deadline': '20:00'},
+        'ssc': {'deadline': '20:00'},
+    })
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = {'ts': 0.0}
+    monkeypatch.setattr(time, 'time', lambda: now['ts'])
+    return now
+
+
+def test_shared_deadline_slot_starts_early_enough_for_every_profile(two_profiles):
+    # One shared fetch (180 s) plus AI, render and send (720 s) for each profile: 1620 s, rounded up to 27 minutes
+    assert two_profiles.schedule_slots() == {(19, 33): ['ibps_rrb', 'ssc']}
+
+
+def test_explicit_schedule_is_not_moved():
+    news_processor = make_processor({
+        'ibps_rrb': {'deadline': '20:00'},
+        'ssc': {'deadline': '20:00', 'schedule': '19:00'},
+    })
+    assert news_processor.schedule_slots() == {(19, 45): ['ibps_rrb'], (19, 0): ['ssc']}
+
+
+def test_profiles_in_one_slot_each_get_their_full_budgets(two_profiles, clock):
+    now = IST.localize(datetime(2026, 10, 19, 19, 33))
+    clock['ts'] = now.timestamp()
+    deadline_ts = now.replace(hour=20, minute=0).timestamp()
+
+    names = ['ibps_rrb', 'ssc']
+    deadlines = two_profiles.run_deadlines(names, now, scheduled=True)
+
+    for deadline in deadlines.values():
+        deadline.start('fetch')
+    assert min(d.remaining('fetch') for d in deadlines.values()) == 180
+    clock['ts'] += 180
+
+    for name in names:
+        deadline = deadlines[name]
+        for stage in ['ai', 'render', 'send']:
+            deadline.start(stage)
+            assert deadline.remaining(stage) == deadline.budgets[stage], f"{name} {stage}"
+            clock['ts'] += deadline.remaining(stage)
+        assert deadline.on_time()
+
+    assert clock['ts'] <= deadline_ts
+
+
+def test_late_second_profile_is_not_squeezed_by_the_first(two_profiles, clock):
+    now = IST.localize(datetime(2026, 10, 19, 19, 45))
+    clock['ts'] = now.timestamp()
+    deadline_ts = now.replace(hour=20, minute=0).timestamp()
+
+    deadlines = two_profiles.run_deadlines(['ibps_rrb', 'ssc'], now, scheduled=True)
+
+    assert deadlines['ssc'].deadline_ts == deadline_ts
+    assert deadlines['ibps_rrb'].deadline_ts == deadline_ts - 720
+
+
+def test_manual_runs_have_no_deadline(two_profiles):
+    now = IST.localize(datetime(2026, 10, 19, 19, 45))
+    deadlines = two_profiles.run_deadlines(['ibps_rrb', 'ssc'], now)
+    assert all(d.deadline_ts is None for d in deadlines.values())
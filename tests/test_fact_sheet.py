@@ -0,0 +1,39 @@
+import pytest
+
+from app import NewsProcessor
+
+
+@pytest.fixture
+def processor():
+    return NewsProcessor.__new__(NewsProcessor)
+
+
+def test_fact_sheet_reads_bold_labels_after_normalizing(processor):
+    content = processor.fix_currency_symbols(
+        'IBPS RRB News - 01 August 2024\n\nEconomic\n\n'
+        '**HEADLINE:** RBI holds rate\n\n**SUMMARY:** The repo rate stays at 6.5% and ₹500 crore is set aside.\n\n'
+        '**GLOSSARY:**\n• Repo rate: Rate at which RBI lends to banks\n'
+    )
+    assert processor.build_fact_sheet(content) == (
+        'IBPS RRB News - 01 August 2024\nNews summaries:\n'
+        '- RBI holds rate: The repo rate stays at 6.5% and Rs.500 crore is set aside.'
+    )
+
+
+def test_fact_sheet_joins_wrapped_summaries(processor):
+    content = (
+        'IBPS RRB News - 01 August 2024\n\nEconomic\n\n'
+        'HEADLINE: RBI holds rate\n\nSUMMARY:\nThe repo rate stays at 6.5%.\nThe stance is unchanged.\n\n'
+        'GLOSSARY:\n• Repo rate: Rate at which RBI lends to banks\n\n'
+        'HEADLINE: GST collections rise\nSUMMARY: Collections grew 6.5%\nto Rs.1.73 lakh crore.\n\n'
+        'Government Schemes\n\nHEADLINE: PM-Kisan instalment released\nSUMMARY: 9.4 crore farmers were paid.\n'
+    )
+    assert processor.build_fact_sheet(content).split('\n')[2:] == [
+        '- RBI holds rate: The repo rate stays at 6.5%. The stance is unchanged.',
+        '- GST collections rise: Collections grew 6.5% to Rs.1.73 lakh crore.',
+        '- PM-Kisan instalment released: 9.4 crore farmers were paid.',
+    ]
+
+
+def test_fact_sheet_is_empty_without_facts(processor):
+    assert processor.build_fact_sheet('IBPS RRB News - 01 August 2024\n\nEconomic\n\nFree-form text only.\n') == ''
@@ -0,0 +1,57 @@
+import threading
+import time
+
+import pytest
+
+from app import Article, NewsProcessor
+
+
+@pytest.fixture
+def processor():
+    news_processor = NewsProcessor.__new__(NewsProcessor)
+    news_processor.fetch_lock = threading.Lock()
+    news_processor.raw_fetch = None
+    news_processor.fetches = []
+
+    def fetch_all_sources(timeout=None):
+        news_processor.fetches.append(timeout)
+        return [Article('RBI holds the repo rate at 6.5 percent', 'd', 's', '', '')], True
+
+    news_processor._fetch_all_sources = fetch_all_sources
+    return news_processor
+
+
+def test_fetch_is_cached_and_reused(processor):
+    first = processor.fetch_raw_articles(timeout=5)
+    assert processor.fetch_raw_articles(timeout=5) is first
+    assert len(processor.fetches) == 1
+
+
+def test_partial_fetch_is_not_cached(processor):
+    stale = [Article('Older complete crawl headline here', 'd', 's', '', '')]
+    processor.raw_fetch = (time.time() - 7200, stale)
+    processor._fetch_all_sources = lambda timeout=None: ([], False)
+
+    assert processor.fetch_raw_articles(timeout=5) == []
+    assert processor.raw_fetch[1] is stale
+
+
+def test_run_does_not_wait_past_its_budget_for_a_prefetch(processor):
+    cached = [Article('Cached headline from an earlier crawl', 'd', 's', '', '')]
+    processor.raw_fetch = (time.time() - 7200, cached)
+    processor.fetch_lock.acquire()
+    try:
+        started = time.perf_counter()
+        assert processor.fetch_raw_articles(max_age=0, timeout=0.2) is cached
+        assert time.perf_counter() - started < 1
+    finally:
+        processor.fetch_lock.release()
+    assert processor.fetches == []
+
+
+def test_time_spent_waiting_comes_out_of_the_fetch_budget(processor):
+    processor.fetch_lock.acquire()
+    threading.Timer(0.3, processor.fetch_lock.release).start()
+
+    processor.fetch_raw_articles(max_age=0, timeout=2)
+    assert processor.fetches[0] < 1.8
@@ -0,0 +1,53 @@
+import os
+
+import pytest
+
+from app import Article, ExamProfile, NewsProcessor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def processor():
+    return NewsProcessor.__new__(NewsProcessor)
+
+
+@pytest.fixture
+def profile():
+    return ExamProfile('ibps_rrb', {'config_dir': os.path.join(ROOT, 'config')})
+
+
+def make_articles():
+    titles = [
+        'Cricket team wins the series',
+        'RBI keeps the repo rate unchanged',
+        'Market regulator eases mutual fund rules',
+        'RBI and SEBI announce joint bank inflation panel',
+        'Fintech payment volumes climb',
+        'Film festival opens in Goa',
+    ]
+    return [Article(title, '', 'test', '', '') for title in titles]
+
+
+def test_filter_articles_orders_by_score_then_arrival(processor, profile):
+    articles = make_articles()
+    scored = [(processor.calculate_relevance_score(article, profile), article.title) for article in articles]
+    expected = [title for score, title in sorted(scored, key=lambda pair: -pair[0]) if score >= 2]
+
+    filtered = processor.filter_articles(articles, profile)
+
+    assert [article.title for article in filtered] == expected
+    assert all(article.relevance_score >= 2 for article in filtered)
+
+
+def test_filter_articles_keeps_only_the_best_candidates(processor, profile, monkeypatch):
+    monkeypatch.setattr(NewsProcessor, 'CANDIDATE_LIMIT', 2)
+    articles = make_articles()
+
+    filtered = processor.filter_articles(articles, profile)
+    everything = sorted(
+        (processor.calculate_relevance_score(article, profile), -index, article.title)
+        for index, article in enumerate(articles)
+    )
+
+    assert [article.title for article in filtered] == [title for _, _, title in reversed(everything[-2:])]
@@ -0,0 +1,71 @@
+import sqlite3
+
+import pytest
+
+import app
+from app import NewsProcessor, ReportCache
+
+REPORT = 'IBPS RRB News - 01 August 2024\n\nEconomic\n\nHEADLINE: RBI holds the repo rate\n\nSUMMARY: The rate stays at 6.5%.\n'
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    news_processor = NewsProcessor.__new__(NewsProcessor)
+    news_processor.default_profile = 'ibps_rrb'
+    news_processor.profiles = {'ibps_rrb': None}
+    news_processor.report_cache = ReportCache()
+    news_processor.setup_database()
+    monkeypatch.setattr(app, 'processor', news_processor)
+
+    conn = sqlite3.connect('news_reports.db')
+    conn.execute('INSERT INTO daily_reports (profile, date, content, articles_count, updated_at) VALUES (?, ?, ?, ?, ?)',
+                 ('ibps_rrb', '01 August 2024', REPORT, 3, 1.0))
+    conn.commit()
+    conn.close()
+    return app.app.test_client()
+
+
+def rewrite_report(content, updated_at):
+    # Stands in for a replay run in a separate process: the web server's cache is never told
+    conn = sqlite3.connect('news_reports.db')
+    conn.execute('UPDATE daily_reports SET content = ?, updated_at = ? WHERE profile = ? AND date = ?',
+                 (content, updated_at, 'ibps_rrb', '01 August 2024'))
+    conn.commit()
+    conn.close()
+
+
+def test_cached_report_is_rebuilt_after_an_outside_rewrite(client):
+    first = client.get('/reports/2024-08-01?format=text')
+    assert first.status_code == 200
+    assert client.get('/reports/2024-08-01?format=text', headers={'If-None-Match': first.headers['ETag']}).status_code == 304
+
+    rewrite_report(REPORT.replace('6.5%', '6.25%'), 2.0)
+
+    second = client.get('/reports/2024-08-01?format=text', headers={'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 200
+    assert b'6.25%' in second.data
+    assert second.headers['ETag'] != first.headers['ETag']
+
+
+def test_report_listing_is_rebuilt_after_a_new_report(client):
+    assert len(client.get('/reports').get_json()['reports']) == 1
+
+    conn = sqlite3.connect('news_reports.db')
+    conn.execute('INSERT INTO daily_reports (profile, date, content, articles_count, updated_at) VALUES (?, ?, ?, ?, ?)',
+                 ('ibps_rrb', '02 August 2024', REPORT, 2, 3.0))
+    conn.commit()
+    conn.close()
+
+    assert len(client.get('/reports').get_json()['reports']) == 2
+
+
+def test_report_detail_makes_clients_revalidate(client):
+    assert client.get('/reports/2024-08-01').headers['Cache-Control'] == 'no-cache'
+
+
+@pytest.mark.parametrize('path', ['/reports?profile=nope', '/reports/2024-08-01?profile=nope', '/quiz?profile=nope'])
+def test_unknown_profile_is_rejected(client, path):
+    response = client.get(path)
+    assert response.status_code == 400
+    assert response.get_json()['message'] == 'Unknown profile: nope'
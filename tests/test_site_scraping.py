@@ -0,0 +1,161 @@
+import os
+import time
+
+import pytest
+
+from app import ConfigLoader, NewsProcessor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, 'tests', 'fixtures', 'sites')
+LIVE_FIXTURES = os.path.join(FIXTURES, 'live')
+
+SITES = {
+    'thehindu': (
+        'https://www.thehindu.com/business/',
+        [
+            {
+                'title': 'RBI keeps repo rate unchanged at 6.5% for ninth time',
+                'description': 'The Monetary Policy Committee voted 4-2 to hold the policy rate while retaining its stance.',
+                'url': 'https://www.thehindu.com/business/Economy/rbi-keeps-repo-rate-unchanged/article68000001.ece',
+                'published': '2024-10-09T10:15:00+05:30',
+            },
+            {
+                'title': 'SEBI tightens rules for futures and options trading',
+                'description': 'The market regulator raised contract sizes and curbed weekly expiries.',
+                'url': 'https://www.thehindu.com/business/markets/sebi-tightens-fo-rules/article68000002.ece',
+                'published': '2024-10-09T09:00:00+05:30',
+            },
+        ],
+    ),
+    'livemint': (
+        'https://www.livemint.com/economy',
+        [
+            {
+                'title': "India's GDP growth slows to 6.7% in the April-June quarter",
+                'description': 'Growth was dragged down by lower government spending during the general elections.',
+                'url': 'https://www.livemint.com/economy/india-gdp-growth-slows-to-6-7-in-q1-11725000000001.html',
+                'published': '2024-08-30T17:45:00+05:30',
+            },
+            {
+                'title': 'Retail inflation eases to 3.54% on high base effect',
+                'description': 'Food inflation also cooled, giving the central bank room to consider rate cuts.',
+                'url': 'https://www.livemint.com/economy/retail-inflation-eases-11725000000002.html',
+                'published': '2024-08-12T16:00:00+05:30',
+            },
+        ],
+    ),
+    'financialexpress': (
+        'https://www.financialexpress.com/economy/',
+        [
+            {
+                'title': 'PM-Kisan 18th instalment of Rs 20,000 crore released to farmers',
+                'description': 'Over 9.4 crore farmers received direct benefit transfers under the scheme.',
+                'url': 'https://www.financialexpress.com/business/banking-finance-pm-kisan-18th-instalment-released-3600001/',
+                'published': '2024-10-05T12:30:00+05:30',
+            },
+            {
+                'title': 'GST collections rise 6.5% to Rs 1.73 lakh crore in September',
+                'description': 'Domestic revenue grew faster than collections from imports.',
+                'url': 'https://www.financialexpress.com/economy/gst-collections-rise-6-5-percent-3600002/',
+                'published': '2024-10-01T18:00:00+05:30',
+            },
+        ],
+    ),
+}
+
+
+@pytest.fixture(scope='module')
+def processor():
+    news_processor = NewsProcessor.__new__(NewsProcessor)
+    news_processor.site_selectors = ConfigLoader.load_json('site_selectors.json', os.path.join(ROOT, 'config'))
+    return news_processor
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES, f'{name}.html'), 'rb') as file:
+        return file.read()
+
+
+def test_every_configured_site_has_a_fixture(processor):
+    configured = set(processor.site_selectors)
+    covered = {site_url.split('/')[2] for site_url, _ in SITES.values()}
+    assert configured == covered
+
+
+@pytest.mark.parametrize('name', sorted(SITES))
+def test_site_rules_extract_articles(processor, name):
+    site_url, expected = SITES[name]
+    articles = processor.parse_news_site(site_url, load_fixture(name))
+
+    assert [
+        {'title': a.title, 'description': a.description, 'url': a.url, 'published': a.published}
+        for a in articles
+    ] == expected
+    assert all(a.source == site_url.split('/')[2] for a in articles)
+
+
+def test_site_rules_respect_limit(processor):
+    site_url, _ = SITES['thehindu']
+    assert len(processor.parse_news_site(site_url, load_fixture('thehindu'), limit=1)) == 1
+
+
+def test_generic_fallback_for_unknown_site(processor):
+    articles = processor.parse_news_site('https://news.example.com/economy/', load_fixture('generic'))
+
+    assert [(a.title, a.description, a.url) for a in articles] == [
+        (
+            'NABARD announces rural credit push for cooperative banks',
+            'The refinance window will support short-term crop loans.',
+            'https://news.example.com/news/nabard-rural-credit-push',
+        ),
+        (
+            'Sensex closes at a record high on banking gains',
+            'Sensex closes at a record high on banking gains',
+            'https://example.com/markets/sensex-record',
+        ),
+        (
+            'Forex reserves climb to a new high of 700 billion dollars',
+            'Reserves rose for the fourth straight week on valuation gains.',
+            'https://news.example.com/economy/forex-reserves',
+        ),
+    ]
+
+
+def test_generic_fallback_when_rules_match_nothing(processor):
+    articles = processor.parse_news_site('https://www.thehindu.com/business/', load_fixture('generic'))
+    assert articles[0].url == 'https://www.thehindu.com/news/nabard-rural-credit-push'
+
+
+@pytest.mark.parametrize('name', sorted(SITES))
+def test_site_rules_match_a_captured_live_page(processor, name):
+    # The hand-built fixtures only mirror the rules; pages saved by tests/capture_site_pages.py check them against the real markup
+    path = os.path.join(LIVE_FIXTURES, f'{name}.html')
+    if not os.path.exists(path):
+        pytest.skip('no captured page, run python tests/capture_site_pages.py')
+    with open(path, 'rb') as file:
+        content = file.read()
+
+    site_url = SITES[name][0]
+    rules = processor.site_selectors[site_url.split('/')[2]]
+    extract = processor._extract_with_xpath if rules.get('engine') == 'xpath' else processor._extract_with_css
+    articles = extract(site_url, content, rules, 10)
+
+    assert len(articles) >= 3, f"{name} rules matched {len(articles)} articles on the live page"
+    assert all(a.url.startswith('https://') and a.url != site_url for a in articles)
+    assert sum(a.description != a.title for a in articles) >= len(articles) // 2
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize('name', sorted(SITES) + ['generic'])
+def test_site_parse_takes_a_few_milliseconds(processor, name):
+    site_url = SITES[name][0] if name in SITES else 'https://news.example.com/'
+    content = load_fixture(name)
+    processor.parse_news_site(site_url, content)
+
+    runs = 20
+    started = time.perf_counter()
+    for _ in range(runs):
+        processor.parse_news_site(site_url, content)
+    elapsed_ms = (time.perf_counter() - started) * 1000 / runs
+
+    assert elapsed_ms < 10, f"{name} took {elapsed_ms:.2f} ms per parse"